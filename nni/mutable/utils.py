@@ -6,27 +6,39 @@ from __future__ import annotations
 __all__ = [
     'uid', 'reset_uid',
     'NoContextError', 'ContextStack', 'get_current_context',
-    'label_scope', 'auto_label',
+    'label_scope', 'auto_label', 'auto_labels',
 ]
 
 import logging
-from collections import defaultdict
-from typing import Any, List, cast
+import threading
+from contextvars import ContextVar
+from typing import Any, Tuple, cast
 
-_last_uid = defaultdict(int)
+_last_uid: dict[str, int] = {}
+_uid_lock = threading.Lock()
+
+# String forms of small uids, so that generating most labels doesn't need an int-to-str conversion.
+_SMALL_INT_STR_SIZE = 1024
+_SMALL_INT_STR = tuple(str(i) for i in range(_SMALL_INT_STR_SIZE))
 
 _logger = logging.getLogger(__name__)
 
+# Whether the warning of global numbering has been emitted.
+_warned_global = False
+
 
 def uid(namespace: str = 'default') -> int:
-    """Global counter for unique id. Not thread-safe."""
-    _last_uid[namespace] += 1
-    return _last_uid[namespace]
+    """Global counter for unique id. Thread-safe."""
+    with _uid_lock:
+        n = _last_uid.get(namespace, 0) + 1
+        _last_uid[namespace] = n
+    return n
 
 
 def reset_uid(namespace: str = 'default') -> None:
     """Reset counter for a specific namespace."""
-    _last_uid[namespace] = 0
+    with _uid_lock:
+        _last_uid[namespace] = 0
 
 
 class NoContextError(IndexError):
@@ -36,7 +48,7 @@ class NoContextError(IndexError):
 
 class ContextStack:
     """
-    This is to maintain a globally-accessible context environment that is visible to everywhere.
+    This is to maintain a context environment that is visible to everywhere within the current thread (or asyncio task).
 
     To initiate::
 
@@ -50,9 +62,14 @@ class ContextStack:
     Notes
     -----
     :class:`ContextStack` is not multi-processing safe. Also, the values will get cleared for a new process.
+    The stacks are stored in context variables, so contexts entered in one thread (or asyncio task)
+    are not visible to other threads.
     """
 
-    _stack: dict[str, list] = defaultdict(list)
+    # One context variable per key, holding an immutable tuple as the stack.
+    _stack: dict[str, ContextVar[tuple]] = {}
+
+    __slots__ = ('key', 'value')
 
     def __init__(self, key: str, value: Any):
         self.key = key
@@ -62,28 +79,39 @@ class ContextStack:
         self.push(self.key, self.value)
         return self
 
-    def __exit__(self, *args, **kwargs):
+    def __exit__(self, exc_type, exc, tb):
         self.pop(self.key)
 
     @classmethod
     def push(cls, key: str, value: Any):
-        cls._stack[key].append(value)
+        var = cls._stack.get(key)
+        if var is None:
+            var = cls._stack.setdefault(key, ContextVar(f'context_stack_{key}', default=()))
+        var.set(var.get() + (value,))
 
     @classmethod
     def pop(cls, key: str) -> Any:
-        if not cls._stack[key]:
+        stack = cls._peek(key)
+        if not stack:
             raise NoContextError(f'Context with key {key} is empty.')
-        return cls._stack[key].pop()
+        cls._stack[key].set(stack[:-1])
+        return stack[-1]
 
     @classmethod
     def top(cls, key: str) -> Any:
-        if not cls._stack[key]:
+        stack = cls._peek(key)
+        if not stack:
             raise NoContextError(f'Context with key {key} is empty.')
-        return cls._stack[key][-1]
+        return stack[-1]
 
     @classmethod
     def stack(cls, key: str) -> list:
-        return list(cls._stack[key])
+        return list(cls._peek(key))
+
+    @classmethod
+    def _peek(cls, key: str) -> tuple:
+        var = cls._stack.get(key)
+        return var.get() if var is not None else ()
 
 
 def get_current_context(key: str) -> Any:
@@ -111,8 +139,9 @@ class label_scope:
     (see examples below), and we guarantee the generation of labels to be reproducible.
     It can also be naturally nested.
 
-    :class:`label_scope` is NOT thread-safe. The behavior is undefined if multiple threads are
-    trying to enter the scope at the same time.
+    The stack of entered scopes is local to the current thread (or asyncio task),
+    so each thread sees its own nesting of :class:`label_scope`. The numbering of a scope is still global though.
+    The behavior is undefined if multiple threads are trying to enter scopes with the same name at the same time.
 
     :class:`label_scope` is implemented based on :class:`ContextStack`.
 
@@ -143,8 +172,11 @@ class label_scope:
     ...     label9 = auto_label()       # global/1/1
     """
 
-    def __init__(self, basename: str | label | label_scope | None = None, *, _path: list[str] | None = None):
-        if isinstance(basename, label):
+    __slots__ = ('basename', '_path', '_ns_cache', 'activated')
+
+    def __init__(self, basename: str | label | label_scope | None = None, *, _path: list[str] | tuple[str, ...] | None = None):
+        # Exact type check first, as it's the common case. Fall back to isinstance for subclasses of label.
+        if type(basename) is label or isinstance(basename, label):
             _path = basename.parts
             basename = None
 
@@ -152,8 +184,15 @@ class label_scope:
             _path = basename.path
             basename = None
 
-        if basename is not None:
-            _validate_label_name(basename)
+        # Validate the label name. The common case (a plain, valid string) only takes one branch.
+        # ``'/' in basename`` is a single C-level scan, which is faster than a regex or set intersection.
+        if basename is not None and (type(basename) is not str or not basename or '/' in basename):
+            if not isinstance(basename, str):
+                raise TypeError('label must be a string')
+            if not basename:
+                raise ValueError('label cannot be empty')
+            if '/' in basename:
+                raise ValueError('label cannot contain slash (`/`). Please use `label_scope` to build hierarchical labels.')
 
         # basename is not assigned at this point.
         # It will be assigned later when "with" is entered.
@@ -163,13 +202,20 @@ class label_scope:
         # The full "path" of current scope.
         # It should also contain the part after the last ``/``.
         # No validation here, because it's not considered as public API.
-        self._path = _path
+        # Stored as a tuple, so that extending it in nested scopes is a single allocation.
+        self._path: tuple[str, ...] | None = tuple(_path) if _path is not None else None
         if self._path is not None:
             assert self._path, 'path should not be empty'
 
         if _path:
             self.basename = _path[-1]
 
+        # The full name of the scope, computed once the path is known.
+        # It's used as the namespace of the uid counter.
+        self._ns_cache: str | None = None
+        if self._path is not None:
+            self._ns_cache = label(self.path)
+
         # The indicator flag to indicate whether the scope is entered.
         self.activated = False
 
@@ -182,22 +228,17 @@ class label_scope:
             parent_scope = label_scope.current()
             if self.basename is None:
                 if parent_scope is None:
-                    # NOTE: It's not recommended to use the default namespace because the stable label numbering cannot be guaranteed.
-                    # However, we allow such usage currently because it's mostly used in evaluator,
-                    # whose initialization relies on trace, and doesn't need to be reproducible in trial code.
-                    _logger.warning(
-                        'Label is not provided, and label scope is also missing. Global numbering will be used. '
-                        'Note that we always recommend specifying `label=...` manually.',
-                    )
+                    _warn_global_numbering()
                     # No parent and doesn't have a name, put it under global namespace.
                     parent_scope = label_scope.global_()
                 self.basename = parent_scope.next_label()
 
             if parent_scope is not None:
                 assert parent_scope.path is not None, 'Parent scope is not entered.'
-                self._path = parent_scope.path + [self.basename]
+                self._path = parent_scope.path + (self.basename,)
             else:
-                self._path = [self.basename]
+                self._path = (self.basename,)
+            self._ns_cache = label(self.path)
 
         # Since path is sometimes already set (e.g., when re-enter),
         # parent_scope is not necessarily the real parent of current scope.
@@ -207,13 +248,16 @@ class label_scope:
         # It also pushes itself into the stack, so as to support nested namespace.
         # For example, currently the top of stack is ['foo', 'bar'], and ['foo', 'bar', '3'] is used,
         # the next thing up is ['foo', 'bar', '4'].
-        # `reset_uid` to count from zero for "foo/bar/4"
+        # `reset_uid` to count from zero for "foo/bar/4".
+        # The reset is skipped if the namespace has never been counted, which is the common case.
         ContextStack.push(_LABEL_NAMESPACE_CONTEXT_KEY, self)
-        reset_uid(self.absolute_scope)
+        namespace = cast(str, self._ns_cache)
+        if namespace in _last_uid:
+            reset_uid(namespace)
         self.activated = True
         return self
 
-    def __exit__(self, *args, **kwargs):
+    def __exit__(self, exc_type, exc, tb):
         ContextStack.pop(_LABEL_NAMESPACE_CONTEXT_KEY)
         self.activated = False
 
@@ -223,7 +267,7 @@ class label_scope:
         return self.path == other.path
 
     @property
-    def path(self) -> list[str] | None:
+    def path(self) -> tuple[str, ...] | None:
         return self._path
 
     @property
@@ -238,15 +282,18 @@ class label_scope:
         For example, ``model/cell/2``.
         """
         self.check_entered()
-        assert self.path is not None, 'This should never happen.'
-        return cast(str, label(self.path))
+        assert self._ns_cache is not None, 'This should never happen.'
+        return self._ns_cache
 
     def __repr__(self):
         return f'label_scope({self.absolute_scope!r})'
 
     def next_label(self) -> str:
         """Generate the "name" part."""
-        return str(uid(self.absolute_scope))
+        if self._ns_cache is None:
+            self.check_entered()
+        n = uid(self._ns_cache)
+        return _SMALL_INT_STR[n] if n < _SMALL_INT_STR_SIZE else str(n)
 
     def check_entered(self) -> None:
         """Raise error if the scope is not entered."""
@@ -266,10 +313,9 @@ class label_scope:
         ...     # somewhere in the middle of the code.
         ...     label_scope.current()     # Return scope1
         """
-        try:
-            return ContextStack.top(_LABEL_NAMESPACE_CONTEXT_KEY)
-        except NoContextError:
-            return None
+        # Peek into the stack directly, rather than catching NoContextError from ``ContextStack.top``.
+        stack = ContextStack._peek(_LABEL_NAMESPACE_CONTEXT_KEY)
+        return stack[-1] if stack else None
 
     @staticmethod
     def global_() -> label_scope:
@@ -277,7 +323,7 @@ class label_scope:
 
         This label scope can be created on-the-fly and can live without the with-blocks.
         """
-        return label_scope('global', _path=['global'])
+        return label_scope('global', _path=('global',))
 
 
 class label(str):
@@ -291,23 +337,55 @@ class label(str):
     Generally, it should work like a string which contains the label name.
     """
 
-    parts: list[str]
+    _parts: tuple[str, ...]
 
-    def __new__(cls, parts: list[str] | str):
+    def __new__(cls, parts: list[str] | tuple[str, ...] | str):
         if isinstance(parts, str):
-            obj = super().__new__(cls, parts)
-            obj.parts = [parts]
-        else:
-            obj = super().__new__(cls, '/'.join(parts))
-            obj.parts = parts
-
+            # Parts will be recovered from the string when needed.
+            return cast(label, super().__new__(cls, parts))
+
+        key = tuple(parts)
+        if cls is not label:
+            # Subclasses are not interned, so that they never leak into plain ``label(...)`` calls.
+            obj = super().__new__(cls, '/'.join(key))
+            obj._parts = key
+            return cast(label, obj)
+
+        # Labels built from the same parts are interned, so that the join is done only once.
+        cached = _label_cache.get(key)
+        if cached is not None:
+            return cached
+
+        obj = super().__new__(cls, '/'.join(key))
+        obj._parts = key
+        if len(_label_cache) >= _LABEL_CACHE_SIZE:
+            # Evict the oldest entry.
+            _label_cache.pop(next(iter(_label_cache)), None)
+        _label_cache[key] = obj
         return cast(label, obj)
 
+    @property
+    def parts(self) -> tuple[str, ...]:
+        """The parts of the label.
+
+        For labels built from a list or tuple, they are the parts given at construction.
+        Otherwise, they are the label string split by ``/``.
+        """
+        parts = self.__dict__.get('_parts')
+        if parts is None:
+            parts = self._parts = tuple(str.split(self, '/'))
+        return parts
+
     def as_scope(self) -> label_scope:
         """Convert the label to a label scope."""
         return label_scope(_path=self.parts)
 
 
+_LABEL_CACHE_SIZE = 4096
+
+_label_cache: dict[tuple, label] = {}
+
+
 def auto_label(name: str | label | None = None, scope: label_scope | None = None) -> str:
     """Automatically generate a formatted and reproducible label.
 
@@ -354,9 +432,10 @@ def auto_label(name: str | label | None = None, scope: label_scope | None = None
     ...     label7 = auto_label()           # another/2
     """
 
-    if isinstance(name, label):
+    # Exact type check first, as it's the common case. Fall back to isinstance for subclasses of label.
+    if type(name) is label or isinstance(name, label):
         # Already a label, no need to do anything.
-        return cast(str, name)
+        return name
 
     # Has scope is a special case, because it might not have been entered.
     if scope is not None:
@@ -365,18 +444,81 @@ def auto_label(name: str | label | None = None, scope: label_scope | None = None
         if name is None:
             name = scope.next_label()
         scope.check_entered()
-        return cast(str, label([*cast(List[str], scope.path), name]))
+        return label((*cast(Tuple[str, ...], scope.path), name))
+
+    # Fast path for the most common case: no name, no scope.
+    # The label is numbered directly under the global scope, without entering (and exiting) a fake scope.
+    if name is None and not ContextStack._peek(_LABEL_NAMESPACE_CONTEXT_KEY):
+        _warn_global_numbering()
+        n = uid('global')
+        return label(('global', _SMALL_INT_STR[n] if n < _SMALL_INT_STR_SIZE else str(n)))
 
     # Fake a label scope and return its name directly.
+    # The name has already been built as a label when the scope is entered.
     with label_scope(name) as scope:
-        assert scope.path is not None
-        return cast(str, label(scope.path))
+        return scope.name
+
+
+def auto_labels(n: int, scope: label_scope | None = None) -> list[str]:
+    """Generate ``n`` labels at once. It's equivalent to calling ``auto_label(scope=scope)`` for ``n`` times,
+    but the scope lookup and the uid counter update are only done once.
+
+    Parameters
+    ----------
+    n
+        Number of labels to generate.
+    scope
+        The scope to use. If not specified, the nearest scope will be used.
+        If no scope is found, the global scope will be used.
+
+    Returns
+    -------
+    A list of labels, numbered consecutively.
+
+    Examples
+    --------
+    >>> with label_scope('model'):
+    ...     labels = auto_labels(3)     # ['model/1', 'model/2', 'model/3']
+    ...     label4 = auto_label()       # model/4
+    """
 
+    if n < 0:
+        raise ValueError(f'Number of labels must be non-negative, but got {n}')
+
+    if scope is None:
+        scope = label_scope.current()
+        if scope is None:
+            _warn_global_numbering()
+            scope = label_scope.global_()
+    elif not isinstance(scope, label_scope):
+        raise TypeError('scope must be an instance of label_scope')
+
+    if type(scope) is not label_scope:
+        # Subclasses might customize how the names are generated.
+        return [auto_label(scope=scope) for _ in range(n)]
+
+    scope.check_entered()
+    namespace = cast(str, scope._ns_cache)
+    with _uid_lock:
+        base = _last_uid.get(namespace, 0)
+        _last_uid[namespace] = base + n
+    path = cast(Tuple[str, ...], scope.path)
+    return [label((*path, _SMALL_INT_STR[i] if i < _SMALL_INT_STR_SIZE else str(i))) for i in range(base + 1, base + n + 1)]
+
+
+def _warn_global_numbering() -> None:
+    # The warning is emitted only once per process,
+    # because unscoped auto_label() can be called many times in a row.
+    global _warned_global
+    if _warned_global:
+        return
+    _warned_global = True
+
+    # NOTE: It's not recommended to use the default namespace because the stable label numbering cannot be guaranteed.
+    # However, we allow such usage currently because it's mostly used in evaluator,
+    # whose initialization relies on trace, and doesn't need to be reproducible in trial code.
+    _logger.warning(
+        'Label is not provided, and label scope is also missing. Global numbering will be used. '
+        'Note that we always recommend specifying `label=...` manually.',
+    )
 
-def _validate_label_name(name: str) -> None:
-    if not isinstance(name, str):
-        raise TypeError('label must be a string')
-    if not name:
-        raise ValueError('label cannot be empty')
-    if '/' in name:
-        raise ValueError('label cannot contain slash (`/`). Please use `label_scope` to build hierarchical labels.')
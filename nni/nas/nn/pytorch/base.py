@@ -412,7 +412,7 @@ class strict_label_scope(label_scope):
         raise ValueError('Label must be specified manually in NAS, or provide a `label_prefix` to the model space.')
 
     @property
-    def path(self) -> Optional[List[str]]:
+    def path(self) -> Optional[Tuple[str, ...]]:
         """A strict label scope is only used for label checking. It shouldn't have its own name."""
         if self._path is None:
             return self._path
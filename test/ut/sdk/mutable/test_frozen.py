@@ -23,6 +23,26 @@ def test_frozen_context():
                 assert frozen_context.current() == {'a': 1, 'b': 2}
 
 
+def test_frozen_context_bypass():
+    from nni.mutable.utils import ContextStack
+
+    with frozen_context.bypass():
+        assert frozen_context.current() is None
+    assert frozen_context.current() is None
+
+    with frozen_context({'a': 1}) as ctx1:
+        with frozen_context({'b': 2}) as ctx2:
+            with frozen_context.bypass():
+                assert ContextStack.stack(ctx1.key) == [{'a': 1}]
+                with frozen_context.bypass():
+                    assert frozen_context.current() is None
+                assert frozen_context.current() == {'a': 1}
+            assert ContextStack.stack(ctx2.key) == [{'a': 1}, {'b': 2}]
+            assert frozen_context.current() == {'a': 1, 'b': 2}
+        assert frozen_context.current() == {'a': 1}
+    assert frozen_context.current() is None
+
+
 def _frozen_context_complex_middle():
     assert frozen_context.current() == {}
 
@@ -55,7 +55,9 @@ def test_label_simple():
     assert label9 == 'global/1/1'
 
 
-def test_auto_label(caplog):
+def test_auto_label(caplog, monkeypatch):
+    from nni.mutable import utils
+    monkeypatch.setattr(utils, '_warned_global', False)
     reset_uid('global')
 
     label1 = auto_label('bar')
@@ -79,6 +81,10 @@ def test_auto_label(caplog):
     assert label6 == 'another/thing'
     assert label7 == 'another/2'
 
+    caplog.clear()
+    auto_label()
+    assert 'recommend' not in caplog.text
+
 
 def test_label_reproducible():
     labels = []
@@ -162,3 +168,111 @@ def test_label_replace():
     assert isinstance(l, label)
     assert isinstance(l, str)
     assert l.replace('/', '__') == 'model__1'
+
+
+def test_label_thread():
+    import threading
+
+    results = {}
+    barrier = threading.Barrier(4, timeout=10)
+
+    def worker(name):
+        with label_scope(name):
+            # Make sure all threads are inside their scopes before generating labels.
+            barrier.wait()
+            labels = []
+            for _ in range(100):
+                labels.append(auto_label())
+                barrier.wait()
+            results[name] = labels
+
+    threads = [threading.Thread(target=worker, args=(f'thread{i}', )) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for i in range(4):
+        assert results[f'thread{i}'] == [f'thread{i}/{j}' for j in range(1, 101)]
+    assert label_scope.current() is None
+
+
+def test_label_asyncio():
+    import asyncio
+
+    async def worker(name):
+        with label_scope(name):
+            labels = []
+            for _ in range(3):
+                # Yield to the other task while inside the scope.
+                await asyncio.sleep(0)
+                labels.append(auto_label())
+            return labels
+
+    async def main():
+        return await asyncio.gather(worker('task1'), worker('task2'))
+
+    results = asyncio.run(main())
+    assert results == [['task1/1', 'task1/2', 'task1/3'], ['task2/1', 'task2/2', 'task2/3']]
+    assert label_scope.current() is None
+
+
+def test_label_interned():
+    from nni.mutable.utils import label
+    parts = ['model', '2']
+    l = label(parts)
+    assert label(['model', '2']) is l
+    parts.append('3')
+    assert l.parts == ('model', '2')
+    assert label('model/2').parts == ('model', '2')
+    assert label(parts) == 'model/2/3'
+
+
+def test_label_interned_subclass():
+    from nni.mutable.utils import label
+
+    class sublabel(label):
+        pass
+
+    s = sublabel(['sub', 'label'])
+    assert type(s) is sublabel
+    l = label(['sub', 'label'])
+    assert type(l) is label
+    assert l is not s
+    assert auto_label(l) is l
+    with label_scope(l) as scope:
+        assert scope.name == 'sub/label'
+
+    assert auto_label(s) is s
+    assert label_scope(s).name == 'sub/label'
+    assert s.parts == ('sub', 'label')
+    with label_scope(s) as scope:
+        assert scope.name == 'sub/label'
+        assert auto_label() == 'sub/label/1'
+        with label_scope('ghi'):
+            assert auto_label(s) is s
+    with s.as_scope():
+        assert auto_label('abc') == 'sub/label/abc'
+
+
+def test_auto_labels():
+    from nni.mutable.utils import auto_labels
+
+    with label_scope('model'):
+        assert auto_labels(3) == ['model/1', 'model/2', 'model/3']
+        assert auto_label() == 'model/4'
+        with label_scope() as scope:
+            assert auto_labels(2) == ['model/5/1', 'model/5/2']
+        assert auto_labels(0) == []
+        assert auto_labels(2, scope) == ['model/5/3', 'model/5/4']
+        assert auto_labels(1) == ['model/6']
+
+    with pytest.raises(ValueError, match='not entered'):
+        auto_labels(2, label_scope('world'))
+
+    with pytest.raises(ValueError):
+        auto_labels(-1)
+
+    reset_uid('global')
+    assert auto_labels(2) == ['global/1', 'global/2']
+    assert auto_label() == 'global/3'